@@ -18,8 +18,8 @@ setup(
     keywords="cli coding assistant",
     packages=find_namespace_packages(where="src"),
     package_dir={"": "src"},
-    python_requires=">=3.7",
-    install_requires=["requests", "astor", "black"],
+    python_requires=">=3.9",
+    install_requires=["requests", "black"],
     extras_require={
         "dev": [
             "twine>=4.0.2",
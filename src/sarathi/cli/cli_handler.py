@@ -1,20 +1,55 @@
 import argparse
+import importlib
+import os
+import sys
 
-import sarathi.cli.gendocstrings as docstrgen
-import sarathi.cli.qahelper as qahelper
-import sarathi.cli.sgit as sgit
+CLI_MODULES = {
+    "git": {
+        "module": "sarathi.cli.sgit",
+        "help": "generate commit messages for staged changes",
+    },
+    "ask": {
+        "module": "sarathi.cli.qahelper",
+        "help": "ask a question to the LLM",
+    },
+    "docstrgen": {
+        "module": "sarathi.cli.gendocstrings",
+        "help": "generate docstrings for a python file or directory",
+    },
+}
+
+
+def _peek_subcommand(argv):
+    """Returns the first positional token in argv, i.e. the requested op.
+
+    Args:
+        argv: The command line arguments, including the program name.
+
+    Returns:
+        str: The first token which is not a flag, or None if there is none.
+    """
+    for token in argv[1:]:
+        if not token.startswith("-"):
+            return token
+    return None
 
 
 def parse_cmd_args():
     """This function parses command line arguments using argparse.
+    Only the module of the requested op is imported and gets its full subparser,
+    the remaining ops are registered as bare stubs carrying only their help text so that they are still listed in help.
 
     Returns:
         argparse.Namespace: The parsed arguments from the command line."""
     parser = argparse.ArgumentParser()
     subparsers = parser.add_subparsers(dest="op")
-    sgit.setup_args(subparsers, opname="git")
-    qahelper.setup_args(subparsers, opname="ask")
-    docstrgen.setup_args(subparsers, opname="docstrgen")
+    selected_op = _peek_subcommand(sys.argv)
+    for opname, cli_module in CLI_MODULES.items():
+        if opname == selected_op:
+            module = importlib.import_module(cli_module["module"])
+            module.setup_args(subparsers, opname=opname)
+        else:
+            subparsers.add_parser(opname, help=cli_module["help"], add_help=False)
     return parser.parse_args()
 
 
@@ -24,16 +59,23 @@ def main():
     - If the op is git, it executes a git command.
     - If the op is ask, it executes a command related to question-answering.
     - If the op is docstrgen, it executes a command related to generating docstrings.
+    Errors raised by the command are reported in one line and exit with status 1, unless SARATHI_DEBUG is set in which case they are re-raised.
     """
+    parsed_args = parse_cmd_args()
+    if parsed_args.op not in CLI_MODULES:
+        print("Unsupported Option")
+        return
+    module_name = CLI_MODULES[parsed_args.op]["module"]
+    module = sys.modules.get(module_name) or importlib.import_module(module_name)
     try:
-        parsed_args = parse_cmd_args()
-        if parsed_args.op == "git":
-            sgit.execute_cmd(parsed_args)
-        elif parsed_args.op == "ask":
-            qahelper.execute_cmd(parsed_args)
-        elif parsed_args.op == "docstrgen":
-            docstrgen.execute_cmd(parsed_args)
-        else:
-            print("Unsupported Option")
+        module.execute_cmd(parsed_args)
+    except KeyboardInterrupt:
+        sys.exit(130)
     except Exception as e:
-        print(f"Exception {e} occured while trying to parse the argument")
+        if os.environ.get("SARATHI_DEBUG"):
+            raise
+        print(
+            f"Exception {e} occured while executing the {parsed_args.op} command. "
+            "Set SARATHI_DEBUG=1 to see the full traceback"
+        )
+        sys.exit(1)
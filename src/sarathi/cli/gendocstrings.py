@@ -1,9 +1,5 @@
-import argparse
-import os
+import functools
 
-from sarathi.code.codetasks import CodeTransformer
-from sarathi.llm.call_llm import call_llm_model
-from sarathi.llm.prompts import prompt_dict
 from sarathi.utils.io import get_filepaths, is_valid_directory, is_valid_file
 
 
@@ -23,13 +19,13 @@ def setup_args(subparsers, opname):
         "-f",
         "--filepath",
         required=False,
-        type=lambda x: is_valid_file(gendocstr_parser, x),
+        type=functools.partial(is_valid_file, gendocstr_parser),
     )
     gendocstr_parser.add_argument(
         "-d",
         "--dirpath",
         required=False,
-        type=lambda x: is_valid_directory(gendocstr_parser, x),
+        type=functools.partial(is_valid_directory, gendocstr_parser),
     )
 
 
@@ -43,6 +39,8 @@ def execute_cmd(args):
     Returns:
         None
     """
+    from sarathi.code.codetasks import CodeTransformer
+
     file_path = args.filepath
     dir_path = args.dirpath
     if file_path and dir_path:
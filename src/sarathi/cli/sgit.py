@@ -12,17 +12,23 @@ def get_staged_diff():
         The staged difference in the git repository as a string.
     """
     return subprocess.run(
-        ["git", "diff", "--staged"], stdout=subprocess.PIPE
-    ).stdout.decode("utf-8")
+        ["git", "diff", "--staged"],
+        stdout=subprocess.PIPE,
+        encoding="utf-8",
+        errors="replace",
+    ).stdout
 
 
 def generate_commit_message():
     """Generates a commit message using a language model.
 
     Returns:
-        The commit message generated by the language model.
+        The commit message generated by the language model, or None if there are no staged changes.
     """
     diff = get_staged_diff()
+    if not diff:
+        print("No staged changes found. Please stage the files you want to commit")
+        return None
     prompt_info = prompt_dict["autocommit"]
     llm_response = call_llm_model(prompt_info, diff)
     return llm_response["choices"][0]["message"]["content"]
@@ -37,6 +43,40 @@ def get_user_confirmation():
     return input(f"Do you want to proceed " + format_green("y/n") + ": ").strip() == "y"
 
 
+def autocommit():
+    """Generates a commit message, shows it to the user and commits the staged changes if the user confirms.
+
+    Returns:
+        None
+    """
+    generated_commit_msg = generate_commit_message()
+    if generated_commit_msg:
+        print("**Below is the generated commit message **\n")
+        print(generated_commit_msg)
+        if get_user_confirmation():
+            subprocess.run(["git", "commit", "-m", generated_commit_msg])
+        else:
+            print("I would try to generate a better commit msgs next time")
+
+
+def gencommit():
+    """Generates a commit message, commits the staged changes with it and opens the editor to amend it.
+
+    Returns:
+        None
+    """
+    generated_commit_msg = generate_commit_message()
+    if generated_commit_msg:
+        subprocess.run(["git", "commit", "-m", generated_commit_msg])
+        subprocess.run(["git", "commit", "--amend"])
+
+
+GIT_SUB_CMDS = {
+    "autocommit": autocommit,
+    "gencommit": gencommit,
+}
+
+
 def setup_args(subparsers, opname):
     """Adds a new sub-parser to the provided subparsers.
 
@@ -49,8 +89,8 @@ def setup_args(subparsers, opname):
     """
     git_parser = subparsers.add_parser(opname)
     git_sub_cmd = git_parser.add_subparsers(dest="git_sub_cmd")
-    git_sub_cmd.add_parser("autocommit")
-    git_sub_cmd.add_parser("gencommit")
+    for sub_cmd_name in GIT_SUB_CMDS:
+        git_sub_cmd.add_parser(sub_cmd_name)
 
 
 def execute_cmd(args):
@@ -63,17 +103,8 @@ def execute_cmd(args):
     Returns:
         None
     """
-    if args.git_sub_cmd == "gencommit":
-        generated_commit_msg = generate_commit_message()
-        if generated_commit_msg:
-            subprocess.run(["git", "commit", "-m", generated_commit_msg])
-            subprocess.run(["git", "commit", "--amend"])
-    elif args.git_sub_cmd == "autocommit":
-        generated_commit_msg = generate_commit_message()
-        if generated_commit_msg:
-            print("**Below is the generated commit message **\n")
-            print(generated_commit_msg)
-            if get_user_confirmation():
-                subprocess.run(["git", "commit", "-m", generated_commit_msg])
-            else:
-                print("I would try to generate a better commit msgs next time")
+    sub_cmd_handler = GIT_SUB_CMDS.get(args.git_sub_cmd)
+    if sub_cmd_handler is None:
+        print("Unsupported Option")
+        return
+    sub_cmd_handler()
@@ -1,12 +1,16 @@
 import ast
+import hashlib
 import subprocess
-
-import astor
+from concurrent.futures import ThreadPoolExecutor
 
 from sarathi.llm.call_llm import call_llm_model
 from sarathi.llm.prompts import prompt_dict
 from sarathi.utils.formatters import format_code
 
+MAX_PARALLEL_LLM_CALLS = 8
+STATEMENT_BLOCK_FIELDS = ("body", "handlers", "orelse", "finalbody", "cases")
+DOCSTRING_CACHE = {}
+
 
 class CodeTransformer:
     def __init__(self, file_path):
@@ -20,31 +24,43 @@ class CodeTransformer:
         """
         self.file_path = file_path
         self.dosctring_prompt = "update_docstrings"
+        self.source_code = None
+        self.tree = None
 
     def get_ast(self):
         """Parse the content of a file and return the abstract syntax tree (AST).
+        The source code and the tree are cached on the instance, so the file is read and parsed only once.
 
         Returns:
             The abstract syntax tree (AST) generated from the content of the file.
         """
-        with open(self.file_path, "r") as file:
-            code = file.read()
-        return ast.parse(code)
+        if self.tree is None:
+            with open(self.file_path, "r") as file:
+                self.source_code = file.read()
+            self.tree = ast.parse(self.source_code)
+        return self.tree
 
     def find_methods(self, tree):
         """Find all the methods in the given abstract syntax tree.
+        Only statement blocks are descended into, since a function definition cannot appear inside an expression.
 
         Args:
             self: The instance of the class.
             tree: The abstract syntax tree to search for methods.
 
         Returns:
-            A list of method nodes found in the abstract syntax tree.
+            A list of method nodes (sync and async) found in the abstract syntax tree, in source order.
         """
         methods = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
+        nodes_to_visit = [tree]
+        while nodes_to_visit:
+            node = nodes_to_visit.pop()
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
                 methods.append(node)
+            child_nodes = []
+            for field in STATEMENT_BLOCK_FIELDS:
+                child_nodes.extend(getattr(node, field, ()))
+            nodes_to_visit.extend(reversed(child_nodes))
         return methods
 
     def format_node_with_new_docstring(self, new_docstring, method):
@@ -58,54 +74,107 @@ class CodeTransformer:
         Returns:
             The new docstring node after formatting.
         """
-        indentation = method.body[0].col_offset if method.body else 0
         new_docstring = new_docstring.replace('"""', "")
         new_docstring = new_docstring.replace("'", "")
-        new_docstring_node = ast.Expr(
-            value=ast.Str(new_docstring), lineno=method.lineno, col_offset=indentation
-        )
+        new_docstring_node = ast.Expr(value=ast.Constant(value=new_docstring))
         return new_docstring_node
 
+    def generate_docstring(self, method_code):
+        """Generates a docstring for the given method code using the language model.
+        Docstrings are cached by a hash of the method code, so identical methods seen during a run only call the language model once.
+
+        Args:
+            method_code: The source code of the method for which the docstring is generated.
+
+        Returns:
+            The docstring text returned by the language model.
+        """
+        code_hash = hashlib.blake2b(method_code.encode(), digest_size=16).digest()
+        if code_hash not in DOCSTRING_CACHE:
+            new_docstring = call_llm_model(
+                prompt_info=prompt_dict[self.dosctring_prompt],
+                user_msg=method_code,
+                resp_type="text",
+            )
+            if new_docstring is None:
+                return None
+            DOCSTRING_CACHE[code_hash] = new_docstring
+        return DOCSTRING_CACHE[code_hash]
+
     def update_docstrings(self, methods, overwrite_existing=False):
         """Update docstrings for the given methods.
 
+        The language model is called concurrently, once per distinct method code,
+        the generated docstrings are then inserted into the tree one method at a time.
+
         Args:
             methods: A list of methods whose docstrings need to be updated.
             overwrite_existing: A boolean flag indicating whether to overwrite existing docstrings. Default is False.
 
         Returns:
-            None.
+            A list of the methods which received a new docstring.
         """
+        methods_by_code = {}
         for method in methods:
+            if overwrite_existing or not has_docstring(method):
+                methods_by_code.setdefault(ast.unparse(method), []).append(method)
+        if not methods_by_code:
+            return []
+        max_workers = min(MAX_PARALLEL_LLM_CALLS, len(methods_by_code))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self.generate_docstring, method_code)
+                for method_code in methods_by_code
+            ]
+        updated_methods = []
+        for same_code_methods, future in zip(methods_by_code.values(), futures):
             try:
-                existing_docstring = ast.get_docstring(method)
-                existing_method_code = ast.unparse(method)
-                if existing_docstring:
-                    if overwrite_existing:
-                        new_docstring = call_llm_model(
-                            prompt_info=prompt_dict[self.dosctring_prompt],
-                            user_msg=existing_method_code,
-                            resp_type="text",
-                        )
+                new_docstring = future.result()
+                if new_docstring is not None:
+                    for method in same_code_methods:
                         new_docstring_node = self.format_node_with_new_docstring(
                             new_docstring, method
                         )
-                        method.body.insert(0, new_docstring_node)
-                    else:
-                        pass
-                else:
-                    new_docstring = call_llm_model(
-                        prompt_info=prompt_dict[self.dosctring_prompt],
-                        user_msg=existing_method_code,
-                        resp_type="text",
-                    )
-                    if new_docstring is not None:
-                        new_docstring_node = self.format_node_with_new_docstring(
-                            new_docstring, method
-                        )
-                        method.body.insert(0, new_docstring_node)
+                        if has_docstring(method):
+                            method.body[0] = new_docstring_node
+                        else:
+                            method.body = [new_docstring_node, *method.body]
+                        updated_methods.append(method)
             except Exception as e:
                 print(f"{e}")
+        return updated_methods
+
+    def splice_methods(self, methods):
+        """Re-renders the given methods and splices them into the original source code.
+
+        Only the lines spanned by the given methods are regenerated and formatted,
+        the rest of the source code (including comments) is kept as is.
+        A method nested inside another given method is rendered as part of the outer one.
+
+        Args:
+            methods: A list of modified method nodes from the tree of this file.
+
+        Returns:
+            The source code of the file with the methods replaced.
+        """
+        # split on "\n" only, ast line numbers do not count the other characters str.splitlines breaks on
+        source_lines = self.source_code.split("\n")
+        methods_to_splice = []
+        last_spliced_line = 0
+        for method in sorted(methods, key=get_start_lineno):
+            if get_start_lineno(method) > last_spliced_line:
+                methods_to_splice.append(method)
+                last_spliced_line = method.end_lineno
+        for method in reversed(methods_to_splice):
+            start_lineno = get_start_lineno(method)
+            first_line = source_lines[start_lineno - 1]
+            indentation = first_line[: len(first_line) - len(first_line.lstrip())]
+            method_code = format_code(ast.unparse(method)).rstrip("\n")
+            source_lines[start_lineno - 1 : method.end_lineno] = [
+                indentation + line if line.strip() else line
+                for line in method_code.split("\n")
+            ]
+        return "\n".join(source_lines)
 
     def transform_code(self, op="update_docstrings"):
         """Transforms the code based on the specified operation.
@@ -117,14 +186,16 @@ class CodeTransformer:
             None
         """
         tree = self.get_ast()
+        modified_methods = []
         if op == "update_docstrings":
             methods = self.find_methods(tree)
-            self.update_docstrings(methods)
-        modified_source = astor.to_source(tree)
+            modified_methods = self.update_docstrings(methods)
+        modified_source = self.splice_methods(modified_methods)
         self.update_code(modified_source)
 
     def update_code(self, updated_code):
         """Update the code in the file with the provided updated code.
+        The file is left untouched if the updated code is identical to the source code it was read from.
 
         Args:
             updated_code: The updated code that needs to be written to the file.
@@ -132,6 +203,40 @@ class CodeTransformer:
         Returns:
             None
         """
-        formatted_code = format_code(updated_code)
+        if updated_code == self.source_code:
+            return
         with open(self.file_path, "w") as f:
-            f.write(formatted_code)
+            f.write(updated_code)
+        self.source_code = updated_code
+        self.tree = None
+
+
+def get_start_lineno(method):
+    """Returns the first line of a method, including its decorators.
+
+    Args:
+        method: The method node.
+
+    Returns:
+        The line number on which the method definition starts.
+    """
+    return min(
+        [method.lineno] + [decorator.lineno for decorator in method.decorator_list]
+    )
+
+
+def has_docstring(method):
+    """Checks whether the first statement of a method is a docstring.
+
+    Args:
+        method: The method node.
+
+    Returns:
+        True if the method body starts with a string literal, False otherwise.
+    """
+    first_statement = method.body[0]
+    return (
+        isinstance(first_statement, ast.Expr)
+        and isinstance(first_statement.value, ast.Constant)
+        and isinstance(first_statement.value.value, str)
+    )
@@ -2,6 +2,8 @@ import os
 
 import requests
 
+http_session = requests.Session()
+
 
 def get_env_var(var_names, default=None, error_msg=None):
     """Generic function to retrieve environment variables."""
@@ -94,7 +96,7 @@ def call_llm_model(prompt_info, user_msg, resp_type=None):
         "stop": None,
         "temperature": 0.7,
     }
-    response = requests.post(url, headers=headers, json=body)
+    response = http_session.post(url, headers=headers, json=body)
     if resp_type == "text":
         text_resp = response.json()["choices"][0]["message"]["content"]
         return text_resp
@@ -1,6 +1,3 @@
-from black import FileMode, format_str
-
-
 def format_green(text):
     """
     Formats the given text in green color.
@@ -22,5 +19,7 @@ def format_code(code):
     Returns:
         The formatted code.
     """
+    from black import FileMode, format_str
+
     out = format_str(code, mode=FileMode())
     return out
@@ -1,5 +1,13 @@
 import os
 
+IGNORE_EXTENSIONS = frozenset({".pycache", ".pyc", ".pyo"})
+IGNORE_FILES = frozenset({"__init__.py"})
+IGNORE_DIRS = frozenset({"__pycache__", "node_modules", "venv"})
+PROJECT_MARKERS = frozenset(
+    {"setup.py", "pyproject.toml", "package.json", "Cargo.toml"}
+)
+BUILD_ARTIFACT_DIRS = frozenset({"build", "dist", "target", "out"})
+
 
 def read_file(file_path):
     """Reads the content of a file.
@@ -47,25 +55,47 @@ def is_valid_directory(parser, arg):
         return arg
 
 
-def get_filepaths(directory, ignore_extensions=None, ignore_files=None):
+def get_filepaths(
+    directory, ignore_extensions=None, ignore_files=None, ignore_dirs=None
+):
     """
     This function returns a list of file paths in the specified directory while ignoring certain file extensions and filenames.
 
     Args:
         directory: A string representing the directory path for which file paths need to be retrieved.
-        ignore_extensions: An optional list of strings representing file extensions to be ignored. Default value is [.pycache, .pyc, .pyo].
-        ignore_files: An optional list of strings representing file names to be ignored. Default value is [__init__.py].
-
-    Returns"""
-    if ignore_extensions is None:
-        ignore_extensions = [".pycache", ".pyc", ".pyo"]
-    if ignore_files is None:
-        ignore_files = ["__init__.py"]
+        ignore_extensions: An optional list of strings representing file extensions to be ignored. Default value is IGNORE_EXTENSIONS.
+        ignore_files: An optional list of strings representing file names to be ignored. Default value is IGNORE_FILES.
+        ignore_dirs: An optional list of directory names which are not descended into. Default value is IGNORE_DIRS. Hidden directories are always skipped,
+            and BUILD_ARTIFACT_DIRS are skipped when they sit directly in a directory containing one of PROJECT_MARKERS.
+
+    Returns:
+        A list of file paths found under the directory."""
+    ignore_extensions = (
+        IGNORE_EXTENSIONS if ignore_extensions is None else frozenset(ignore_extensions)
+    )
+    ignore_files = IGNORE_FILES if ignore_files is None else frozenset(ignore_files)
+    ignore_dirs = IGNORE_DIRS if ignore_dirs is None else frozenset(ignore_dirs)
     file_paths = []
-    for root, directories, files in os.walk(directory):
-        for filename in files:
-            if not any(filename.endswith(ext) for ext in ignore_extensions):
-                if filename not in ignore_files:
-                    filepath = os.path.join(root, filename)
-                    file_paths.append(filepath)
+    dirs_to_scan = [directory]
+    while dirs_to_scan:
+        current_dir = dirs_to_scan.pop()
+        try:
+            with os.scandir(current_dir) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        skip_dirs = ignore_dirs
+        if not PROJECT_MARKERS.isdisjoint(entry.name for entry in entries):
+            skip_dirs = ignore_dirs | BUILD_ARTIFACT_DIRS
+        for entry in entries:
+            name = entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if not name.startswith(".") and name not in skip_dirs:
+                    dirs_to_scan.append(entry.path)
+            elif entry.is_file():
+                dot = name.rfind(".")
+                if dot >= 0 and name[dot:] in ignore_extensions:
+                    continue
+                if name not in ignore_files:
+                    file_paths.append(entry.path)
     return file_paths
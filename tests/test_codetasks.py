@@ -0,0 +1,57 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from sarathi.code import codetasks
+from sarathi.code.codetasks import CodeTransformer
+
+
+def slow_llm_model(**kwargs):
+    time.sleep(0.1)
+    return "Doc."
+
+
+class CodeTransformerTest(unittest.TestCase):
+    def setUp(self):
+        codetasks.DOCSTRING_CACHE.clear()
+
+    def transform(self, source_code):
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".py", delete=False, newline=""
+        ) as f:
+            f.write(source_code)
+        self.addCleanup(os.remove, f.name)
+        with mock.patch.object(
+            codetasks, "call_llm_model", side_effect=slow_llm_model
+        ) as call_llm_model:
+            CodeTransformer(f.name).transform_code()
+        self.llm_calls = call_llm_model.call_count
+        with open(f.name, newline="") as f:
+            return f.read()
+
+    def test_line_breaks_other_than_newline_above_method(self):
+        source_code = 'x = 1\n\x0c\ns = "a\u2028b"\n\n\ndef f():\n    return 1\n'
+        expected = (
+            'x = 1\n\x0c\ns = "a\u2028b"\n\n\n'
+            'def f():\n    """Doc."""\n    return 1\n'
+        )
+        self.assertEqual(self.transform(source_code), expected)
+
+    def test_nested_method_keeps_indentation(self):
+        source_code = "class A:\n    def f(self):\n        return 1\n"
+        expected = 'class A:\n    def f(self):\n        """Doc."""\n        return 1\n'
+        self.assertEqual(self.transform(source_code), expected)
+
+    def test_identical_methods_call_llm_once(self):
+        source_code = "".join(
+            f"class A{i}:\n    def __init__(self):\n        pass\n\n\n"
+            for i in range(3)
+        )
+        self.assertEqual(self.transform(source_code).count('"""Doc."""'), 3)
+        self.assertEqual(self.llm_calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()